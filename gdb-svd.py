@@ -17,42 +17,189 @@
 # You should have received a copy of the GNU General Public License
 # along with svd-tools.  If not, see <https://www.gnu.org/licenses/>.
 
+from __future__ import annotations
+
+import bisect
+import hashlib
+import os
+import pickle
 import re
+import struct
 import gdb
-from terminaltables import AsciiTable
-from cmsis_svd.parser import SVDParser, SVDAccessType
-from textwrap import wrap
-from colorama import Fore, Style
-import traceback
+from typing import TYPE_CHECKING, NamedTuple
+from textwrap import TextWrapper, wrap
+
+# cmsis_svd is only needed once an svd file is loaded, it is imported there
+# so that sourcing this script stays cheap
+if TYPE_CHECKING:
+    from cmsis_svd.model import SVDAccessType
+
+# ANSI color sequences, all empty when NO_COLOR is set (https://no-color.org)
+if os.environ.get("NO_COLOR"):
+    _RED = _YELLOW = _BLUE = _CYAN = _BLACK = _RESET = ""
+else:
+    _RED = "\x1b[31m"
+    _YELLOW = "\x1b[33m"
+    _BLUE = "\x1b[34m"
+    _CYAN = "\x1b[36m"
+    _BLACK = "\x1b[30m"
+    _RESET = "\x1b[0m"
 
 
 def error(msg):
-    return f"{Fore.RED}{msg}{Style.RESET_ALL}"
+    return _RED + msg + _RESET
 
 
 def warning(msg):
-    return f"{Fore.YELLOW}{msg}{Style.RESET_ALL}"
+    return _YELLOW + msg + _RESET
 
 
 def info(msg):
-    return f"{Fore.BLUE}{msg}{Style.RESET_ALL}"
+    return _BLUE + msg + _RESET
 
 
 def highlight(msg):
-    return f"{Fore.CYAN}{msg}{Style.RESET_ALL}"
+    return _CYAN + msg + _RESET
 
 
 def colorize_prefix(prefix, txt):
-    if not txt.startswith(prefix):
+    # an empty prefix would only add escape sequences around nothing
+    if not prefix or not txt.startswith(prefix):
         return txt
-    return f"{highlight(prefix)}{txt[len(prefix) :]}"
+    return _CYAN + prefix + _RESET + txt[len(prefix) :]
 
 
 def heading(columns):
-    return [f"{Fore.BLACK}{col}{Style.RESET_ALL}" for col in columns]
+    return [_BLACK + col + _RESET for col in columns]
+
+
+# SVD_DEBUG set in the environment adds the traceback to command errors
+_DEBUG = bool(os.environ.get("SVD_DEBUG"))
+
+
+def report_error(inst):
+    """Write the error of a failed command, and its traceback when debugging"""
+    gdb.write(error(f"{inst}\n"))
+    if _DEBUG:
+        import traceback
+
+        traceback.print_exc()
+
+
+_STRIP_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def visible_len(txt):
+    """Length of txt on the terminal, ANSI color sequences excluded"""
+    if "\x1b" not in txt:
+        return len(txt)
+    return len(_STRIP_ANSI.sub("", txt))
+
+
+def measure_cell(cell):
+    """Split cell into its lines, each paired with its visible length"""
+    return [(txt, visible_len(txt)) for txt in str(cell).split("\n")]
+
+
+def table_borders(widths, title=None):
+    """Return the top border, holding title when it fits, and the plain border"""
+    border = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+    top = border
+    if title is not None:
+        title_len = visible_len(title)
+        if title_len <= len(border) - 2:
+            top = f"+{title}{border[title_len + 1 :]}"
+    return top, border
+
+
+def table_row_lines(measured_row, widths):
+    """Return the lines of a row of measured cells, padded to widths"""
+    lines = []
+    parts = [""] * len(widths)
+    for line in range(max(len(cell) for cell in measured_row)):
+        for col, cell in enumerate(measured_row):
+            txt, length = cell[line] if line < len(cell) else ("", 0)
+            parts[col] = txt + " " * (widths[col] - length)
+        lines.append("".join(("| ", " | ".join(parts), " |")))
+    return lines
+
+
+def emit_table(rows, title=None, out=None):
+    """Write rows as an ascii table, the first row being the heading
+
+    Cells may hold several lines. The title is embedded in the top border
+    when it fits. The table is written with out, gdb.write by default.
+    """
+    if out is None:
+        out = gdb.write
+
+    # measure every cell line once, keeping its length for the padding
+    widths = [0] * len(rows[0])
+    cells = []
+    for row in rows:
+        measured_row = [measure_cell(cell) for cell in row]
+        for col, lines in enumerate(measured_row):
+            widths[col] = max(widths[col], *(length for _, length in lines))
+        cells.append(measured_row)
+
+    top, border = table_borders(widths, title)
+
+    # one list of lines joined once, ending with "" for the trailing newline
+    table = [top]
+    for index, row in enumerate(cells):
+        table.extend(table_row_lines(row, widths))
+        if index == 0:
+            table.append(border)
+    table.append(border)
+    table.append("")
+
+    out("\n".join(table))
+
+
+def stream_table(head, rows, widths, title=None, out=None):
+    """Write an ascii table whose rows are written as soon as they are produced
+
+    Unlike emit_table the column widths are given rather than measured, so
+    rows may be any iterable, each row being written before the next one is
+    computed. Every cell line must fit in its column width.
+    """
+    if out is None:
+        out = gdb.write
+
+    top, border = table_borders(widths, title)
+    lines = table_row_lines([measure_cell(cell) for cell in head], widths)
+    out("\n".join([top, *lines, border, ""]))
+    for row in rows:
+        lines = table_row_lines([measure_cell(cell) for cell in row], widths)
+        out("\n".join([*lines, ""]))
+    out(f"{border}\n")
+
+
+def wrap_fields(fields, width):
+    """Join field strings into lines of at most width visible characters
+
+    Unlike textwrap, the color sequences take no width and a field is never
+    split, a field wider than width gets a line of its own.
+    """
+    lines = []
+    line = []
+    line_len = -1
+    for txt in fields:
+        length = visible_len(txt)
+        if line and line_len + 1 + length > width:
+            lines.append(" ".join(line))
+            line = []
+            line_len = -1
+        line.append(txt)
+        line_len += 1 + length
+    if line:
+        lines.append(" ".join(line))
+    return "\n".join(lines)
 
 
 def allowed_to_read(access: SVDAccessType | None):
+    from cmsis_svd.model import SVDAccessType
+
     return access in [
         None,
         SVDAccessType.READ_ONLY,
@@ -62,6 +209,8 @@ def allowed_to_read(access: SVDAccessType | None):
 
 
 def allowed_to_write(access: SVDAccessType | None):
+    from cmsis_svd.model import SVDAccessType
+
     return access in [
         None,
         SVDAccessType.WRITE_ONLY,
@@ -73,10 +222,334 @@ def allowed_to_write(access: SVDAccessType | None):
 
 def get_access_str(access: SVDAccessType | None):
     if access is None:
+        from cmsis_svd.model import SVDAccessType
+
         return SVDAccessType.READ_WRITE.value
     return access.value
 
 
+# registers of an address block less than this many words apart are read
+# with a single command
+READ_SPAN_GAP = 64
+# but a command never reads more than this many words, to bound its output
+READ_SPAN_MAX = 256
+
+# "<address>: <value>" line of a single word read, the value is group 1
+_MDW_RE = re.compile(
+    r"^\s*(?:0x)?[0-9a-f]+:\s*(?:0x)?([0-9a-f]+)\b", re.IGNORECASE | re.MULTILINE
+)
+
+# register values read since the target last stopped, {address: value}
+_value_cache = {}
+
+
+def clear_value_cache(event=None):
+    """Forget the read register values, the target may have changed them"""
+    _value_cache.clear()
+
+
+SVD_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "svd-tools"
+)
+# bump when the layout of the cached device changes
+SVD_CACHE_VERSION = 3
+
+# wrap width of the svd info descriptions, wrapped once when parsing the svd
+DESC_WIDTH = 100
+
+
+def get_cache_path(pathfile):
+    """Return the pickle cache path of an svd file.
+
+    The key covers the file path, mtime and size, so an edited svd file
+    never hits a stale entry. The entry also records the cmsis_svd version
+    that parsed the file, see load_device.
+    """
+    stat = os.stat(pathfile)
+    key = f"{SVD_CACHE_VERSION}:{os.path.abspath(pathfile)}:{stat.st_mtime}:{stat.st_size}"
+    return os.path.join(SVD_CACHE_DIR, f"{hashlib.sha1(key.encode()).hexdigest()}.pkl")
+
+
+def load_device(pathfile):
+    """Load the device described by an svd file, using the pickle cache if possible"""
+    cache_path = get_cache_path(pathfile)
+    try:
+        with open(cache_path, "rb") as cache:
+            parser_version, device = pickle.load(cache)
+
+        # loading the device has imported cmsis_svd already
+        import cmsis_svd
+
+        # another cmsis_svd version may not parse the file the same way
+        if parser_version == cmsis_svd.__version__:
+            return device
+    except Exception:
+        # missing, truncated or unpicklable cache entry, parse the xml
+        pass
+
+    import cmsis_svd
+    from cmsis_svd.parser import SVDParser
+
+    parser = SVDParser.for_xml_file(pathfile)
+    device = parser.get_device()
+    wrap_descriptions(device)
+
+    tmp_path = f"{cache_path}.{os.getpid()}"
+    try:
+        os.makedirs(SVD_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as cache:
+            pickle.dump((cmsis_svd.__version__, device), cache, protocol=5)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        # the cache is only an optimization, never fail the load on it, nor
+        # leave a partial entry behind
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+    return device
+
+
+def wrap_descriptions(device):
+    """Store the DESC_WIDTH wrapped description of every item of device
+
+    This runs before the device is pickled, so the cache holds the wrapped
+    descriptions and svd info never wraps text.
+    """
+    for peripheral in device.get_peripherals():
+        items = [peripheral]
+        for register in peripheral.get_registers():
+            items.append(register)
+            items.extend(register.get_fields())
+        for item in items:
+            item._wrapped_desc = "\n".join(wrap(item.description or "", DESC_WIDTH))
+
+
+class FieldSpec(NamedTuple):
+    """Display name, shift, mask and reset value of a register field
+
+    reset_str is the field string shown while the field holds its reset value.
+    """
+
+    name: str
+    shift: int
+    mask: int
+    reset_value: int
+    reset_str: str
+
+
+class Backend(NamedTuple):
+    """gdb commands reading and writing target memory, see detect_backend
+
+    With word_format, the struct format of a target word, memory is rather
+    accessed through the gdb inferior, with no command output to parse.
+    Without any block read, registers are read one by one.
+    """
+
+    read_cmd: str | None
+    read_block_cmd: str | None
+    write_cmd: str | None
+    word_format: str | None = None
+
+
+def detect_backend():
+    """Probe the gdb remote and return the Backend suited to it"""
+    version = gdbserver = ""
+
+    try:
+        version = gdb.execute("monitor version", False, True)
+    except Exception:
+        pass
+
+    if "Open On-Chip Debugger" in version:
+        return Backend(
+            "monitor mdw phys {address:#x}",
+            "monitor mdw phys {address:#x} {count}",
+            "monitor mww phys {address:#x} {value:#x}",
+        )
+
+    try:
+        gdbserver = gdb.execute("monitor gdbserver status", False, True)
+    except Exception:
+        pass
+
+    if "gdbserver for" in gdbserver:
+        return Backend(
+            "monitor rw {address:#x}", None, "monitor ww {address:#x} {value:#x}"
+        )
+
+    word_format = "<I"
+    try:
+        if "big endian" in gdb.execute("show endian", False, True):
+            word_format = ">I"
+    except Exception:
+        pass
+
+    return Backend(None, None, None, word_format)
+
+
+class RegisterRow(NamedTuple):
+    """Cells of a register in the svd get and svd dump tables"""
+
+    name: str
+    address: int
+    value: str
+    fields: str
+
+
+def name_index(items):
+    """Return items by uppercase name, the sorted names and the items in that order"""
+    by_name = {item._name_upper: item for item in items}
+    sorted_names = sorted(by_name)
+    return by_name, sorted_names, [by_name[name] for name in sorted_names]
+
+
+class SvdIndex:
+    """Peripherals of a device, in svd order and indexed by uppercase name
+
+    by_name serves exact lookups, sorted_names and sorted_items, the
+    peripherals in the order of these names, serve prefix lookups.
+    """
+
+    __slots__ = ("items", "by_name", "sorted_names", "sorted_items")
+
+    def __init__(self, peripherals):
+        self.items = list(peripherals)
+        self.by_name, self.sorted_names, self.sorted_items = name_index(self.items)
+
+
+def index_device(device):
+    """Index the peripherals, registers and fields of device by name
+
+    Every item gets its uppercase name, each level a dict for exact lookups,
+    a sorted list of names and the matching list of items for prefix
+    lookups, see name_index and prefix_matches. The peripheral level is the
+    returned SvdIndex, kept on the device.
+    Peripherals get the flat list of their registers, register arrays and
+    clusters expanded, and registers the flat list of their fields.
+    Items also get their access string, peripherals and registers their
+    address string, registers their absolute address, address block,
+    read/write permissions, reset value, the FieldSpec of their fields and
+    the fields string of their reset state.
+    """
+    if getattr(device, "_index", None) is not None:
+        return device._index
+
+    peripherals = device.get_peripherals()
+    for peripheral in peripherals:
+        peripheral._name_upper = peripheral.name.upper()
+        peripheral._addr_str = f"{peripheral.base_address:#08x}"
+        peripheral._access_str = get_access_str(peripheral.access)
+        registers = peripheral._registers = peripheral.get_registers()
+        blocks = [
+            (
+                peripheral.base_address + block.offset,
+                peripheral.base_address + block.offset + block.size,
+            )
+            for block in peripheral.address_blocks or ()
+        ]
+        for register in registers:
+            register._name_upper = register.name.upper()
+            # array and cluster registers are not parented to the peripheral,
+            # their offset is still relative to its base address
+            register._abs_addr = peripheral.base_address + register.address_offset
+            register._addr_str = f"{register._abs_addr:#08x}"
+            # (start, end) of the address block holding the register, if any
+            register._block = next(
+                (b for b in blocks if b[0] <= register._abs_addr < b[1]), None
+            )
+            register._can_read = allowed_to_read(register.access)
+            register._can_write = allowed_to_write(register.access)
+            register._access_str = get_access_str(register.access)
+            # an svd without any reset value shows 0 rather than failing
+            register._reset_value = register.reset_value or 0
+
+            register._fields = register.get_fields()
+            register._field_specs = []
+            for field in register._fields:
+                field._name_upper = field.name.upper()
+                field._access_str = get_access_str(field.access)
+
+                lsb = field.bit_offset
+                msb = field.bit_offset + field.bit_width - 1
+                mask = (1 << field.bit_width) - 1
+                name = f"{field.name}[{msb}:{lsb}]"
+                reset = (register._reset_value >> lsb) & mask
+                register._field_specs.append(
+                    FieldSpec(name, lsb, mask, reset, f"{name}={reset:#x}({reset:#x})")
+                )
+            # fields string of a register at its reset value
+            register._reset_fields = " ".join(
+                field_spec.reset_str for field_spec in register._field_specs
+            )
+
+            (
+                register._field_by_name,
+                register._field_names_sorted,
+                register._fields_sorted,
+            ) = name_index(register._fields)
+
+        (
+            peripheral._reg_by_name,
+            peripheral._reg_names_sorted,
+            peripheral._regs_sorted,
+        ) = name_index(registers)
+
+    device._index = SvdIndex(peripherals)
+    return device._index
+
+
+def prefix_range(sorted_names, prefix):
+    """Return the slice bounds of the names of a sorted list starting with prefix"""
+    if not prefix:
+        return 0, len(sorted_names)
+    lo = bisect.bisect_left(sorted_names, prefix)
+    # the names starting with prefix sort before its successor string
+    successor = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return lo, bisect.bisect_left(sorted_names, successor, lo)
+
+
+def prefix_matches(sorted_names, prefix):
+    """Return the names of a sorted list starting with prefix"""
+    lo, hi = prefix_range(sorted_names, prefix)
+    return sorted_names[lo:hi]
+
+
+def prefix_lookup(sorted_names, sorted_items, prefix):
+    """Return the items, sorted as sorted_names, whose name starts with prefix"""
+    lo, hi = prefix_range(sorted_names, prefix)
+    return sorted_items[lo:hi]
+
+
+def parse_mdw(out, values):
+    """Parse the "addr: word word ..." lines of a mdw output into values
+
+    OpenOCD output is regular enough to be tokenized with str.split, which
+    is much cheaper than a regex on long blocks. Lines which are not memory
+    lines (warnings, errors...) are skipped, an output without any memory
+    line raises.
+    """
+    found = False
+    for line in out.splitlines():
+        parts = line.split()
+        if len(parts) < 2 or not parts[0].endswith(":"):
+            continue
+
+        try:
+            addr = int(parts[0][:-1], 16)
+            words = [int(word, 16) for word in parts[1:]]
+        except ValueError:
+            continue
+
+        for i, word in enumerate(words):
+            values[addr + 4 * i] = word
+        found = True
+
+    if not found:
+        raise Exception(f"Unexpected read output: {out.strip()}")
+
+
 def parse_args(raw: str):
     """Parse a raw argument string into a list using gdb facilities.
 
@@ -123,12 +596,7 @@ class GdbSvd(gdb.Command):
 
             pathfile = argv[0]
             gdb.write(f"Svd Loading {pathfile} ")
-            parser = SVDParser.for_xml_file(pathfile)
-            device = parser.get_device()
-
-            peripherals = dict(
-                (peripheral.name, peripheral) for peripheral in device.peripherals
-            )
+            device = load_device(pathfile)
 
         except Exception as inst:
             gdb.write(f"\n{inst}\n")
@@ -138,138 +606,108 @@ class GdbSvd(gdb.Command):
         else:
             gdb.write("Done\n")
 
-            GdbSvdGetCmd(device, peripherals)
-            GdbSvdSetCmd(device, peripherals)
-            GdbSvdInfoCmd(device, peripherals)
-            # GdbSvdDumpCmd(device, peripherals)
+            index = index_device(device)
+            # the target may have changed since the last load, probe it again
+            # and forget the values read from it
+            backend = detect_backend()
+            clear_value_cache()
+            GdbSvdGetCmd(index, backend)
+            GdbSvdSetCmd(index, backend)
+            GdbSvdInfoCmd(index, backend)
+            GdbSvdDumpCmd(index, backend)
 
 
 if __name__ == "__main__":
+    # read values only hold while the target stays stopped and untouched
+    gdb.events.cont.connect(clear_value_cache)
+    gdb.events.exited.connect(clear_value_cache)
+    gdb.events.memory_changed.connect(clear_value_cache)
     GdbSvd()
 
 
 class GdbSvdCmd(gdb.Command):
-    def __init__(self, device, peripherals):
-        self.device = device
-        self.peripherals = peripherals
-        self.column_with = 100
-        version = gdbserver = []
-
-        try:
-            version = gdb.execute("monitor version", False, True)
-        except Exception:
-            pass
-
-        try:
-            gdbserver = gdb.execute("monitor gdbserver status", False, True)
-        except Exception:
-            pass
-
-        if "Open On-Chip Debugger" in version:
-            self.read_cmd = "monitor mdw phys {address:#x}"
-            self.write_cmd = "monitor mww phys {address:#x} {value:#x}"
-
-        elif "gdbserver for" in gdbserver:
-            self.read_cmd = "monitor rw {address:#x}"
-            self.write_cmd = "monitor ww {address:#x} {value:#x}"
-        else:
-            self.read_cmd = "x /x {address:#x}"
-            self.write_cmd = "set *(int *){address:#x}={value:#x}"
+    __slots__ = (
+        "index",
+        "column_with",
+        "field_wrapper",
+        "read_cmd",
+        "read_block_cmd",
+        "word_format",
+        "write_cmd",
+    )
+
+    def __init__(self, index, backend):
+        self.index = index
+        self.column_with = DESC_WIDTH
+        self.field_wrapper = TextWrapper(width=self.column_with)
+        self.read_cmd = backend.read_cmd
+        self.read_block_cmd = backend.read_block_cmd
+        self.write_cmd = backend.write_cmd
+        self.word_format = backend.word_format
 
     def complete(self, text, word):
-        def prefix_matches(options, prefix):
-            p = prefix.upper()
-            return [o for o in options if o.upper().startswith(p)]
+        return GdbSvdCmd.complete_args(self, parse_args(str(text)), text.endswith(" "))
 
+    def complete_args(self, args, is_space_at_end):
+        """Complete the last of the parsed peripheral, register, field args"""
         try:
-            args = parse_args(str(text))
-            is_space_at_end = text.endswith(" ")
-            nb_args = len(args)
-            peripheral_arg = args[0].upper() if nb_args > 0 else ""
-            register_arg = args[1].upper() if nb_args > 1 else ""
-            field_arg = args[2].upper() if nb_args > 2 else ""
-
-            peripheral_names = self.peripherals.keys()
-            peripheral_matches = prefix_matches(peripheral_names, peripheral_arg)
-
-            if len(peripheral_matches) != 1:
-                if nb_args <= 1:
-                    return peripheral_matches
-                return gdb.COMPLETE_NONE
-
-            peripheral_name = peripheral_matches[0]
-            if peripheral_name != peripheral_arg or (
-                nb_args == 1 and not is_space_at_end
-            ):
-                return peripheral_matches
-
-            peripheral = self.peripherals[peripheral_name]
-            register_names = [reg.name for reg in peripheral.registers]
-            register_matches = prefix_matches(register_names, register_arg)
-
-            if len(register_matches) != 1:
-                if nb_args <= 2:
-                    return register_matches
-                return gdb.COMPLETE_NONE
-
-            register_name = register_matches[0]
-            if register_name != register_arg or (nb_args == 2 and not is_space_at_end):
-                return register_matches
-
-            register = [r for r in peripheral.registers if r.name == register_arg][0]
-            field_names = [field.name for field in register.fields]
-            field_matches = prefix_matches(field_names, field_arg)
-
-            if len(field_matches) != 1:
-                if nb_args <= 3:
-                    return field_matches
-                return gdb.COMPLETE_NONE
-
-            field_name = field_matches[0]
-            if field_name != field_arg or (nb_args == 3 and not is_space_at_end):
-                return field_matches
-
-            return gdb.COMPLETE_NONE
+            if not args or is_space_at_end:
+                # a new argument is started, complete it from scratch
+                args = [*args, ""]
+
+            # walk down the peripheral, register and field indexes
+            by_name = self.index.by_name
+            sorted_names = self.index.sorted_names
+            for depth, arg in enumerate(args):
+                arg = arg.upper()
+                if depth == len(args) - 1:
+                    return prefix_matches(sorted_names, arg)
+
+                item = by_name.get(arg)
+                if item is None or depth == 2:
+                    return gdb.COMPLETE_NONE
+
+                if depth == 0:
+                    by_name = item._reg_by_name
+                    sorted_names = item._reg_names_sorted
+                else:
+                    by_name = item._field_by_name
+                    sorted_names = item._field_names_sorted
 
         except Exception as inst:
-            gdb.write(error(f"{inst}\n"))
-            traceback.print_exc()
+            report_error(inst)
 
     def print_desc_peripherals(self, peripherals, peripheral_prefix=""):
         table_show = []
         table_show.append(heading(["name", "base", "access", "description"]))
         for peripheral in peripherals:
             name = colorize_prefix(peripheral_prefix, peripheral.name)
-
-            desc = "\n".join(wrap(peripheral.description, self.column_with))
             table_show.append(
                 [
                     name,
-                    f"{peripheral.base_address:#08x}",
-                    get_access_str(peripheral.access),
-                    desc,
+                    peripheral._addr_str,
+                    peripheral._access_str,
+                    peripheral._wrapped_desc,
                 ]
             )
 
-        desc_table = AsciiTable(table_show, title=" Peripherals ")
-        gdb.write(f"{desc_table.table}\n")
+        emit_table(table_show, title=" Peripherals ")
 
     def print_desc_registers(self, breadcrumbs, registers, register_prefix=""):
         table_rows = []
         table_rows.append(heading(["name", "address", "access", "description"]))
         for register in registers:
             name = colorize_prefix(register_prefix, register.name)
-
-            addr = register.parent.base_address + register.address_offset
-            desc = "\n".join(wrap(register.description, self.column_with))
             table_rows.append(
-                [name, f"{addr:#08x}", get_access_str(register.access), desc]
+                [
+                    name,
+                    register._addr_str,
+                    register._access_str,
+                    register._wrapped_desc,
+                ]
             )
 
-        desc_table = AsciiTable(
-            table_rows, title=f" {highlight(breadcrumbs)} Registers "
-        )
-        gdb.write(f"{desc_table.table}\n")
+        emit_table(table_rows, title=f" {highlight(breadcrumbs)} Registers ")
 
     def print_desc_fields(self, breadcrumbs, fields, field_prefix=""):
         table_rows = []
@@ -280,72 +718,125 @@ class GdbSvdCmd(gdb.Command):
             lsb = field.bit_offset
             msb = field.bit_offset + field.bit_width - 1
             bit_range = f"[{msb}:{lsb}]"
-            desc = "\n".join(wrap(field.description, self.column_with))
-            table_rows.append([name, bit_range, get_access_str(field.access), desc])
-
-        desc_table = AsciiTable(table_rows, title=f" {highlight(breadcrumbs)} Fields ")
-        gdb.write(f"{desc_table.table}\n")
-
-    def get_field_name(self, field):
-        lsb = field.bit_offset
-        msb = field.bit_offset + field.bit_width - 1
-        return f"{field.name}[{msb}:{lsb}]"
-
-    def get_field_value(self, bit_offset, bit_width, reg_values):
-        return (reg_values >> bit_offset) & ((1 << bit_width) - 1)
+            table_rows.append([name, bit_range, field._access_str, field._wrapped_desc])
 
-    def get_field_string(self, field, reset_value, value):
-        field_reset_value = self.get_field_value(
-            field.bit_offset, field.bit_width, reset_value
-        )
-
-        field_name = self.get_field_name(field)
-        field_value = self.get_field_value(field.bit_offset, field.bit_width, value)
-        field_string = f"{field_name}={field_value:#x}({field_reset_value:#x})"
+        emit_table(table_rows, title=f" {highlight(breadcrumbs)} Fields ")
 
-        if field_value != field_reset_value:
-            field_string = highlight(field_string)
+    def get_field_string(self, field_spec, value):
+        field_name, shift, mask, field_reset_value, reset_str = field_spec
+        field_value = (value >> shift) & mask
+        if field_value == field_reset_value:
+            return reset_str
 
-        return field_string
+        return f"{_CYAN}{field_name}={field_value:#x}({field_reset_value:#x}){_RESET}"
 
-    def get_register_row(self, register, register_prefix=""):
+    def get_register_row(
+        self, register, register_prefix="", values=None, error_width=None
+    ):
         name = colorize_prefix(register_prefix, register.name)
-        reset_value = register.reset_value
-        addr = register.parent.base_address + register.address_offset
+        reset_value = register._reset_value
+        addr = register._abs_addr
+
+        if not register._can_read:
+            return RegisterRow(name, addr, warning(register._access_str), "")
 
         try:
-            value = self.read(register)
-        except NotReadableError:
-            return name, addr, warning(get_access_str(register.access)), ""
+            value = values.get(addr) if values else None
+            if value is None:
+                value = self.read(register)
         except Exception as err:
-            return name, addr, error("Error"), error(str(err))
-
-        field_str_parts = []
-        for field in register.fields:
-            f_str_part = self.get_field_string(field, reset_value, value)
-            field_str_parts.append(f_str_part)
+            err_str = "\n".join(
+                error(txt) for txt in wrap(str(err), error_width or self.column_with)
+            )
+            return RegisterRow(name, addr, error("Error"), err_str)
 
-        field_str = " ".join(field_str_parts)
-        val_str = f"{value:#x}({reset_value:#x})"
         if value != reset_value:
-            val_str = highlight(val_str)
-
-        return name, addr, val_str, "\n".join(wrap(field_str, self.column_with))
+            val_str = f"{_CYAN}{value:#x}({reset_value:#x}){_RESET}"
+            # textwrap would count and split the color sequences of the fields
+            field_str = wrap_fields(
+                [
+                    self.get_field_string(field_spec, value)
+                    for field_spec in register._field_specs
+                ],
+                self.column_with,
+            )
+        else:
+            val_str = f"{value:#x}({reset_value:#x})"
+            field_str = "\n".join(self.field_wrapper.wrap(register._reset_fields))
 
-    def print_registers(self, breadcrumbs, registers, register_prefix=""):
-        regs_table = []
-        regs_table.append(heading(["name", "address", "value", "fields"]))
+        return RegisterRow(name, addr, val_str, field_str)
 
+    def get_register_widths(self, registers):
+        """Widest cell each register row column can hold, known before any read"""
+        head = ["name", "address", "value", "fields"]
+        widths = [len(col) for col in head]
         for register in registers:
-            regs_table.append(
-                self.get_register_row(register, register_prefix=register_prefix)
+            widths[0] = max(widths[0], len(register.name))
+            widths[1] = max(widths[1], len(str(register._abs_addr)))
+            if not register._can_read:
+                widths[2] = max(widths[2], len(register._access_str))
+                continue
+            # a read returns one word and a field value never exceeds its mask
+            value_len = len(f"{0xFFFFFFFF:#x}({register._reset_value:#x})")
+            field_lens = [
+                len(f"{spec.name}={spec.mask:#x}({spec.reset_value:#x})")
+                for spec in register._field_specs
+            ]
+            # fields are wrapped to the column width, never split
+            fields_len = min(sum(field_lens) + len(field_lens) - 1, self.column_with)
+            widths[2] = max(widths[2], value_len, len("Error"))
+            widths[3] = max(widths[3], fields_len, *field_lens)
+        return widths
+
+    def print_registers(
+        self, breadcrumbs, registers, register_prefix="", out=None, values=None
+    ):
+        """Write the register table, each row as soon as its value is known
+
+        Column widths come from get_register_widths, so the rows of registers
+        read one at a time show up without waiting for the whole peripheral.
+        """
+        if values is None:
+            values = self.read_registers(registers)
+
+        widths = self.get_register_widths(registers)
+        rows = (
+            self.get_register_row(
+                register,
+                register_prefix=register_prefix,
+                values=values,
+                error_width=widths[3],
             )
+            for register in registers
+        )
 
-        rval_table = AsciiTable(
-            regs_table, title=f" {highlight(breadcrumbs)} Registers "
+        stream_table(
+            heading(["name", "address", "value", "fields"]),
+            rows,
+            widths,
+            title=f" {highlight(breadcrumbs)} Registers ",
+            out=out,
         )
 
-        gdb.write(f"{rval_table.table}\n")
+    def print_peripherals_registers(self, peripherals, out=None):
+        """Write the register table of each of peripherals
+
+        The registers of all peripherals are read beforehand, spans of block
+        reads stay within the address blocks of the peripherals.
+        """
+        peripherals = [p for p in peripherals if p._registers]
+        values = self.read_registers(
+            [
+                register
+                for peripheral in peripherals
+                for register in peripheral._registers
+            ]
+        )
+
+        for peripheral in peripherals:
+            GdbSvdCmd.print_registers(
+                self, peripheral.name, peripheral._registers, out=out, values=values
+            )
 
     def set_register(self, register, value, field=None):
         val = value
@@ -356,7 +847,8 @@ class GdbSvdCmd(gdb.Command):
 
             mask = max_val << field.bit_offset
 
-            # read register value with gdb
+            # read register value with gdb, never from the value cache
+            _value_cache.pop(register._abs_addr, None)
             val = self.read(register)
 
             val &= ~mask
@@ -365,28 +857,148 @@ class GdbSvdCmd(gdb.Command):
         # write val to target
         self.write(register, val)
 
+    def get_read_spans(self, registers):
+        """Coalesce the readable registers into (address, word count) spans
+
+        Registers with a read action (FIFO pop, clear on read) are left to
+        the single register read. A span never covers them nor a write-only
+        register, it ends before them. Registers already in the value cache
+        are left out.
+
+        A span only skips over the words between registers within an address
+        block of their peripheral, elsewhere it ends at the first word no
+        register declares.
+        """
+        readable = set()
+        write_only = set()
+        barriers = set()
+        blocks = {}
+        for register in registers:
+            if not register._can_read:
+                write_only.add(register._abs_addr)
+            elif register.read_action is not None:
+                barriers.add(register._abs_addr)
+            else:
+                readable.add(register._abs_addr)
+                blocks[register._abs_addr] = register._block
+
+        # a write-only register sharing its address with a readable one
+        # (TX/RX data registers) does not stop a span
+        barriers |= write_only - readable
+        addresses = readable - barriers - _value_cache.keys()
+        block = None
+
+        spans = []
+        stopped = False
+        for addr, is_barrier in sorted(
+            [(addr, False) for addr in addresses] + [(addr, True) for addr in barriers]
+        ):
+            if is_barrier:
+                stopped = True
+                continue
+
+            # unaligned registers are left to the single register read
+            if addr % 4:
+                continue
+
+            if spans and not stopped:
+                start, count = spans[-1]
+                new_count = (addr - start) // 4 + 1
+                gap = addr - (start + 4 * count)
+                if new_count <= READ_SPAN_MAX and (
+                    gap <= 0
+                    or block is not None
+                    and blocks[addr] == block
+                    and gap <= 4 * READ_SPAN_GAP
+                ):
+                    spans[-1] = (start, new_count)
+                    continue
+
+            spans.append((addr, 1))
+            block = blocks[addr]
+            stopped = False
+
+        return spans
+
+    def read_registers(self, registers):
+        """Read registers with one command per span, return {address: value}
+
+        An empty dict is returned when the backend has no block read, the
+        registers are then read one by one.
+        """
+        return self.read_spans(self.get_read_spans(registers))
+
+    def read_spans(self, spans):
+        """Read (address, word count) spans, return {address: value}"""
+        values = {}
+        if self.read_block_cmd is None and self.word_format is None:
+            return values
+
+        for start, count in spans:
+            try:
+                values.update(self.read_block(start, count))
+            except Exception:
+                # a hole of the span may fault, fall back on single reads
+                continue
+
+        return values
+
+    def read_block(self, address, count):
+        """Read count words from address in one go, return {address: value}"""
+        if self.read_block_cmd is not None:
+            cmd = self.read_block_cmd.format(address=address, count=count)
+            values = {}
+            parse_mdw(gdb.execute(cmd, False, True), values)
+            if len(values) != count:
+                # the read failed part way, keep none of it
+                raise Exception(f"Incomplete read of {count} words at {address:#x}")
+        else:
+            # binary read, no text output to parse
+            memory = gdb.selected_inferior().read_memory(address, 4 * count)
+            words = struct.iter_unpack(self.word_format, memory)
+            values = {address + 4 * index: word for index, (word,) in enumerate(words)}
+        _value_cache.update(values)
+        return values
+
     def read(self, register):
         """Read register and return an integer"""
         # access could be not defined for a register
-        if not allowed_to_read(register.access):
+        if not register._can_read:
             raise NotReadableError()
 
-        addr = register.parent.base_address + register.address_offset
-        cmd = self.read_cmd.format(address=addr)
-        pattern = re.compile(r"(?P<ADDR>\w+):( *?(?P<VALUE>[a-f0-9]+))")
+        value = _value_cache.get(register._abs_addr)
+        if value is not None:
+            return value
+
+        if self.word_format is not None:
+            memory = gdb.selected_inferior().read_memory(register._abs_addr, 4)
+            (value,) = struct.unpack(self.word_format, memory)
+        else:
+            cmd = self.read_cmd.format(address=register._abs_addr)
+
+            out = gdb.execute(cmd, False, True)
+            match = _MDW_RE.search(out)
+            if match is None:
+                raise Exception(f"Unexpected read output: {out.strip()}")
 
-        match = re.search(pattern, gdb.execute(cmd, False, True))
-        val = int(match.group("VALUE"), 16)
-        return val
+            value = int(match.group(1), 16)
+
+        _value_cache[register._abs_addr] = value
+        return value
 
     def write(self, register, val):
         """Write data to memory"""
-        if not allowed_to_write(register.access):
+        if not register._can_write:
             raise NotWritableError()
 
-        addr = register.parent.base_address + register.address_offset
-        cmd = self.write_cmd.format(address=addr, value=val)
+        # a write may change other registers too (BSRR -> ODR, W1C flags)
+        clear_value_cache()
+        if self.word_format is not None:
+            memory = struct.pack(self.word_format, val)
+            gdb.selected_inferior().write_memory(register._abs_addr, memory)
+            return
 
+        cmd = self.write_cmd.format(address=register._abs_addr, value=val)
         gdb.execute(cmd, False, True)
 
 
@@ -394,8 +1006,10 @@ class GdbSvdCmd(gdb.Command):
 class GdbSvdGetCmd(GdbSvdCmd):
     """Get register(s) value(s): svd get [peripheral] [register]"""
 
-    def __init__(self, device, peripherals):
-        GdbSvdCmd.__init__(self, device, peripherals)
+    __slots__ = ()
+
+    def __init__(self, index, backend):
+        GdbSvdCmd.__init__(self, index, backend)
         gdb.Command.__init__(self, "svd get", gdb.COMMAND_DATA)
 
     def complete(self, text, word):
@@ -405,7 +1019,7 @@ class GdbSvdGetCmd(GdbSvdCmd):
         if len(args) == 2 and text.endswith(" "):
             return gdb.COMPLETE_NONE
 
-        return GdbSvdCmd.complete(self, text, word)
+        return GdbSvdCmd.complete_args(self, args, text.endswith(" "))
 
     def invoke(self, arg, from_tty):
         try:
@@ -415,17 +1029,18 @@ class GdbSvdGetCmd(GdbSvdCmd):
                 gdb.execute("help svd get")
                 return
 
+            if len(args) == 0:
+                GdbSvdCmd.print_peripherals_registers(self, self.index.items)
+                return
+
             peripheral_arg = args[0].upper()
-            peripheral_matches = list(
-                filter(
-                    lambda x: x.name.startswith(peripheral_arg),
-                    self.device.peripherals,
-                )
+            peripheral_matches = prefix_lookup(
+                self.index.sorted_names, self.index.sorted_items, peripheral_arg
             )
 
             if len(peripheral_matches) == 0:
                 gdb.write(error(f"No peripheral with prefix '{peripheral_arg}'\n"))
-                GdbSvdCmd.print_desc_peripherals(self, self.device.peripherals)
+                GdbSvdCmd.print_desc_peripherals(self, self.index.items)
                 return
 
             if len(peripheral_matches) > 1:
@@ -443,7 +1058,7 @@ class GdbSvdGetCmd(GdbSvdCmd):
             peripheral = peripheral_matches[0]
             breadcrumbs = f"{peripheral.name}"
 
-            if peripheral.name != peripheral_arg:
+            if peripheral._name_upper != peripheral_arg:
                 gdb.write(
                     warning(
                         f"Only one peripheral with prefix '{peripheral_arg}' found: {peripheral.name}\n"
@@ -451,12 +1066,12 @@ class GdbSvdGetCmd(GdbSvdCmd):
                 )
 
             if len(args) == 1:
-                GdbSvdCmd.print_registers(self, breadcrumbs, peripheral.registers)
+                GdbSvdCmd.print_registers(self, breadcrumbs, peripheral._registers)
                 return
 
             register_arg = args[1].upper()
-            register_matches = list(
-                filter(lambda x: x.name.startswith(register_arg), peripheral.registers)
+            register_matches = prefix_lookup(
+                peripheral._reg_names_sorted, peripheral._regs_sorted, register_arg
             )
 
             if len(register_matches) == 0:
@@ -465,22 +1080,23 @@ class GdbSvdGetCmd(GdbSvdCmd):
                         f"No registers with prefix '{register_arg}' for peripheral '{peripheral.name}'\n"
                     )
                 )
-                GdbSvdCmd.print_desc_registers(self, breadcrumbs, peripheral.registers)
+                GdbSvdCmd.print_desc_registers(self, breadcrumbs, peripheral._registers)
                 return
 
             GdbSvdCmd.print_registers(
                 self, breadcrumbs, register_matches, register_prefix=register_arg
             )
         except Exception as inst:
-            gdb.write(error(f"{inst}\n"))
-            traceback.print_exc()
+            report_error(inst)
 
 
 class GdbSvdSetCmd(GdbSvdCmd):
     """Set register value: svd set <peripheral> <register> [field] <value>"""
 
-    def __init__(self, device, peripherals):
-        GdbSvdCmd.__init__(self, device, peripherals)
+    __slots__ = ()
+
+    def __init__(self, index, backend):
+        GdbSvdCmd.__init__(self, index, backend)
         gdb.Command.__init__(self, "svd set", gdb.COMMAND_DATA)
 
     def complete(self, text, word):
@@ -490,17 +1106,17 @@ class GdbSvdSetCmd(GdbSvdCmd):
         if len(args) == 3 and text.endswith(" "):
             return gdb.COMPLETE_NONE
 
-        return GdbSvdCmd.complete(self, text, word)
+        return GdbSvdCmd.complete_args(self, args, text.endswith(" "))
 
     def invoke(self, arg, from_tty):
         args = parse_args(str(arg))
 
         try:
             peripheral_name = args[0].upper()
-            peripheral = self.peripherals[peripheral_name]
+            peripheral = self.index.by_name[peripheral_name]
         except Exception:
             gdb.write("Invalid peripheral name\n")
-            GdbSvdCmd.print_desc_peripherals(self, self.device.peripherals)
+            GdbSvdCmd.print_desc_peripherals(self, self.index.items)
             return
 
         if len(args) < 3 or len(args) > 4:
@@ -508,13 +1124,34 @@ class GdbSvdSetCmd(GdbSvdCmd):
             gdb.execute("help svd set")
             return
 
+        register_name = args[1].upper()
         try:
-            register_name = args[1].upper()
-            register = [r for r in peripheral.registers if r.name == register_name][0]
-            field = None
-            if len(args) == 4:
-                field_name = args[2].upper()
-                field = [f for f in register.fields if f.name == field_name][0]
+            register = peripheral._reg_by_name[register_name]
+        except KeyError:
+            gdb.write(
+                error(
+                    f"No register '{register_name}' for peripheral '{peripheral.name}'\n"
+                )
+            )
+            GdbSvdCmd.print_desc_registers(self, peripheral.name, peripheral._registers)
+            return
+
+        field = None
+        if len(args) == 4:
+            field_name = args[2].upper()
+            try:
+                field = register._field_by_name[field_name]
+            except KeyError:
+                gdb.write(
+                    error(f"No field '{field_name}' in register '{register.name}'\n")
+                )
+                GdbSvdCmd.print_desc_fields(
+                    self, f"{peripheral.name}:{register.name}", register._fields
+                )
+                return
+
+        try:
+            if field is not None:
                 value = int(args[3], 16)
             else:
                 value = int(args[2], 16)
@@ -531,8 +1168,10 @@ class GdbSvdSetCmd(GdbSvdCmd):
 class GdbSvdInfoCmd(GdbSvdCmd):
     """Info on Peripheral|register|field: svd info <peripheral> [register] [field]"""
 
-    def __init__(self, device, peripherals):
-        GdbSvdCmd.__init__(self, device, peripherals)
+    __slots__ = ()
+
+    def __init__(self, index, backend):
+        GdbSvdCmd.__init__(self, index, backend)
         gdb.Command.__init__(self, "svd info", gdb.COMMAND_DATA)
 
     def complete(self, text, word):
@@ -542,12 +1181,12 @@ class GdbSvdInfoCmd(GdbSvdCmd):
         if len(args) == 3 and text.endswith(" "):
             return gdb.COMPLETE_NONE
 
-        return GdbSvdCmd.complete(self, text, word)
+        return GdbSvdCmd.complete_args(self, args, text.endswith(" "))
 
     def invoke(self, arg, from_tty):
         try:
             if arg == "":
-                GdbSvdCmd.print_desc_peripherals(self, self.device.peripherals)
+                GdbSvdCmd.print_desc_peripherals(self, self.index.items)
                 return
 
             args = parse_args(str(arg))
@@ -557,16 +1196,13 @@ class GdbSvdInfoCmd(GdbSvdCmd):
                 return
 
             peripheral_arg = args[0].upper()
-            peripheral_matches = list(
-                filter(
-                    lambda x: x.name.startswith(peripheral_arg),
-                    self.device.peripherals,
-                )
+            peripheral_matches = prefix_lookup(
+                self.index.sorted_names, self.index.sorted_items, peripheral_arg
             )
 
             if len(peripheral_matches) == 0:
                 gdb.write(error(f"No peripheral with prefix '{peripheral_arg}'\n"))
-                GdbSvdCmd.print_desc_peripherals(self, self.device.peripherals)
+                GdbSvdCmd.print_desc_peripherals(self, self.index.items)
                 return
 
             if len(peripheral_matches) > 1:
@@ -584,7 +1220,7 @@ class GdbSvdInfoCmd(GdbSvdCmd):
             peripheral = peripheral_matches[0]
             breadcrumbs = f"{peripheral.name}"
 
-            if peripheral.name != peripheral_arg:
+            if peripheral._name_upper != peripheral_arg:
                 gdb.write(
                     warning(
                         f"Only one peripheral with prefix '{peripheral_arg}' found: {peripheral.name}\n"
@@ -592,12 +1228,12 @@ class GdbSvdInfoCmd(GdbSvdCmd):
                 )
 
             if len(args) == 1:
-                GdbSvdCmd.print_desc_registers(self, breadcrumbs, peripheral.registers)
+                GdbSvdCmd.print_desc_registers(self, breadcrumbs, peripheral._registers)
                 return
 
             register_arg = args[1].upper()
-            register_matches = list(
-                filter(lambda x: x.name.startswith(register_arg), peripheral.registers)
+            register_matches = prefix_lookup(
+                peripheral._reg_names_sorted, peripheral._regs_sorted, register_arg
             )
 
             if len(register_matches) == 0:
@@ -606,7 +1242,7 @@ class GdbSvdInfoCmd(GdbSvdCmd):
                         f"No registers with prefix '{register_arg}' for peripheral '{peripheral.name}'\n"
                     )
                 )
-                GdbSvdCmd.print_desc_registers(self, breadcrumbs, peripheral.registers)
+                GdbSvdCmd.print_desc_registers(self, breadcrumbs, peripheral._registers)
                 return
 
             if len(register_matches) > 1:
@@ -624,7 +1260,7 @@ class GdbSvdInfoCmd(GdbSvdCmd):
             register = register_matches[0]
             breadcrumbs += f":{register.name}"
 
-            if register.name != register_arg:
+            if register._name_upper != register_arg:
                 gdb.write(
                     warning(
                         f"Only one register with prefix '{register_arg}' found: {register.name}\n"
@@ -632,12 +1268,12 @@ class GdbSvdInfoCmd(GdbSvdCmd):
                 )
 
             if len(args) == 2:
-                GdbSvdCmd.print_desc_fields(self, breadcrumbs, register.fields)
+                GdbSvdCmd.print_desc_fields(self, breadcrumbs, register._fields)
                 return
 
             field_arg = args[2].upper()
-            field_matches = list(
-                filter(lambda x: x.name.startswith(field_arg), register.fields)
+            field_matches = prefix_lookup(
+                register._field_names_sorted, register._fields_sorted, field_arg
             )
 
             if len(field_matches) == 0:
@@ -646,7 +1282,7 @@ class GdbSvdInfoCmd(GdbSvdCmd):
                         f"No fields with prefix '{field_arg}' in register '{register.name}'\n"
                     )
                 )
-                GdbSvdCmd.print_desc_fields(self, breadcrumbs, register.fields)
+                GdbSvdCmd.print_desc_fields(self, breadcrumbs, register._fields)
                 return
 
             GdbSvdCmd.print_desc_fields(
@@ -654,62 +1290,61 @@ class GdbSvdInfoCmd(GdbSvdCmd):
             )
 
         except Exception as inst:
-            gdb.write(error(f"{inst}\n"))
-            traceback.print_exc()
-
-
-# class GdbSvdDumpCmd(GdbSvdCmd):
-#     """Get register(s) value(s): svd dump <filename> [peripheral]"""
-
-#     def __init__(self, device, peripherals):
-#         GdbSvdCmd.__init__(self, device, peripherals)
-#         gdb.Command.__init__(self, "svd dump", gdb.COMMAND_DATA)
-
-#     def complete(self, text, word):
-#         args = parse_args(str(text))
-#         nb_args = len(args)
-
-#         if nb_args == 1:
-#             return gdb.COMPLETE_FILENAME
-
-#         if nb_args > 2:
-#             return gdb.COMPLETE_NONE
-
-#         # remove first argument <filename>
-#         args.pop(0)
-
-#         return GdbSvdCmd.complete(self, " ".join(args), word)
-
-#     def invoke(self, arg, from_tty):
-#         args = parse_args(str(arg))
-#         if len(args) < 1 or len(args) > 2:
-#             gdb.write("Invalid parameter\n")
-#             gdb.execute("help svd dump")
-#             return
-#         try:
-#             output_file_name = args[0]
-#             gdb.write(f"Print to file: {output_file_name}\n")
-
-#             if len(args) >= 2:
-#                 periph_name = args[1].upper()
-#                 periphs = list(
-#                     filter(
-#                         lambda x: x.name.startswith(periph_name),
-#                         self.device.peripherals,
-#                     )
-#                 )
-#                 regs = None
-#             else:
-#                 periphs = self.device.peripherals
-
-#             try:
-#                 file_object = open(output_file_name, "w")
-#                 file_object.write("Registers Dump\n")
-#                 file_object.close()
-#                 for per in periphs:
-#                     regs = per.registers
-#                     GdbSvdCmd.print_registers(self, per, regs, output_file_name, False)
-#             except:
-#                 gdb.write(f"Error writting to file: {output_file_name}\n")
-#         except:
-#             gdb.write("Error cannot dump registers\n")
+            report_error(inst)
+
+
+class GdbSvdDumpCmd(GdbSvdCmd):
+    """Get register(s) value(s): svd dump <filename> [peripheral]"""
+
+    __slots__ = ()
+
+    def __init__(self, index, backend):
+        GdbSvdCmd.__init__(self, index, backend)
+        gdb.Command.__init__(self, "svd dump", gdb.COMMAND_DATA)
+
+    def complete(self, text, word):
+        args = parse_args(str(text))
+        nb_args = len(args)
+        is_space_at_end = text.endswith(" ")
+
+        if nb_args == 0 or (nb_args == 1 and not is_space_at_end):
+            return gdb.COMPLETE_FILENAME
+
+        if nb_args > 2 or (nb_args == 2 and is_space_at_end):
+            return gdb.COMPLETE_NONE
+
+        # remove first argument <filename>
+        return GdbSvdCmd.complete_args(self, args[1:], is_space_at_end)
+
+    def invoke(self, arg, from_tty):
+        try:
+            args = parse_args(str(arg))
+            if len(args) < 1 or len(args) > 2:
+                gdb.write(error("Invalid parameter\n"))
+                gdb.execute("help svd dump")
+                return
+
+            output_file_name = args[0]
+            peripherals = self.index.items
+            if len(args) == 2:
+                peripheral_arg = args[1].upper()
+                peripherals = prefix_lookup(
+                    self.index.sorted_names, self.index.sorted_items, peripheral_arg
+                )
+                if len(peripherals) == 0:
+                    gdb.write(error(f"No peripheral with prefix '{peripheral_arg}'\n"))
+                    return
+
+            gdb.write(f"Print to file: {output_file_name}\n")
+            with open(output_file_name, "w") as file_object:
+
+                def out(txt):
+                    file_object.write(_STRIP_ANSI.sub("", txt))
+
+                out("Registers Dump\n")
+                GdbSvdCmd.print_peripherals_registers(self, peripherals, out=out)
+
+        except OSError as inst:
+            gdb.write(error(f"Error writing to file: {inst}\n"))
+        except Exception as inst:
+            report_error(inst)
@@ -0,0 +1,633 @@
+"""Tests of gdb-svd.py, run outside gdb with: python -m unittest discover tests
+
+The gdb module only exists inside gdb, a minimal stand-in providing what the
+script uses is installed in sys.modules before loading it.
+"""
+
+import importlib.util
+import os
+import shlex
+import struct
+import sys
+import tempfile
+import types
+import unittest
+from textwrap import TextWrapper
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA = os.path.join(ROOT, "tests", "data")
+
+
+class FakeMemoryError(RuntimeError):
+    """Stand-in of gdb.MemoryError"""
+
+
+class FakeTarget:
+    """Memory of a target answering the OpenOCD monitor mdw/mww commands
+
+    With monitor unset, it is a plain gdb remote only accessed through the
+    inferior memory.
+    """
+
+    def __init__(self):
+        self.memory = {}
+        self.commands = []
+        # raw output of the mdw commands, instead of the memory words
+        self.mdw_output = None
+        self.monitor = True
+        self.word_format = "<I"
+        # addresses whose inferior memory access faults
+        self.faults = set()
+        # (address, length) of the inferior memory reads
+        self.reads = []
+
+    def execute(self, cmd, from_tty=False, to_string=False):
+        self.commands.append(cmd)
+        args = cmd.split()
+        if args == ["show", "endian"]:
+            endian = "big" if self.word_format == ">I" else "little"
+            return f"The target endianness is set automatically ({endian} endian).\n"
+        if args[0] == "monitor" and not self.monitor:
+            raise RuntimeError('"monitor" command not supported by this target.')
+        if args == ["monitor", "version"]:
+            return "Open On-Chip Debugger 0.12.0\n"
+        if args[:3] == ["monitor", "mdw", "phys"]:
+            if self.mdw_output is not None:
+                return self.mdw_output
+            address = int(args[3], 16)
+            count = int(args[4]) if len(args) > 4 else 1
+            lines = []
+            for index in range(count):
+                if index % 4 == 0:
+                    lines.append(f"0x{address + 4 * index:08x}:")
+                lines[-1] += f" {self.memory.get(address + 4 * index, 0):08x}"
+            return " \n".join(lines) + " \n"
+        if args[:3] == ["monitor", "mww", "phys"]:
+            self.memory[int(args[3], 16)] = int(args[4], 16)
+            return ""
+        raise RuntimeError(f"unexpected command {cmd}")
+
+    def read_memory(self, address, length):
+        self.reads.append((address, length))
+        data = b""
+        for word_address in range(address, address + length, 4):
+            if word_address in self.faults:
+                raise FakeMemoryError(
+                    f"Cannot access memory at address {word_address:#x}"
+                )
+            data += struct.pack(self.word_format, self.memory.get(word_address, 0))
+        return data
+
+    def write_memory(self, address, buffer):
+        if address in self.faults:
+            raise FakeMemoryError(f"Cannot access memory at address {address:#x}")
+        (self.memory[address],) = struct.unpack(self.word_format, buffer)
+
+
+def make_gdb(target):
+    gdb = types.ModuleType("gdb")
+
+    class Command:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    gdb.Command = Command
+    gdb.COMMAND_DATA = 0
+    gdb.COMPLETE_NONE = 0
+    gdb.COMPLETE_FILENAME = 1
+    gdb.string_to_argv = shlex.split
+    gdb.execute = target.execute
+    gdb.selected_inferior = lambda: target
+    gdb.MemoryError = FakeMemoryError
+    gdb.output = []
+    gdb.write = gdb.output.append
+    return gdb
+
+
+def load_script(target):
+    sys.modules["gdb"] = make_gdb(target)
+    spec = importlib.util.spec_from_file_location(
+        "gdb_svd", os.path.join(ROOT, "gdb-svd.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class GdbSvdTestCase(unittest.TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        os.environ["XDG_CACHE_HOME"] = cache_dir.name
+        self.target = FakeTarget()
+        self.svd = load_script(self.target)
+
+    def parse(self, name):
+        from cmsis_svd.parser import SVDParser
+
+        return SVDParser.for_xml_file(os.path.join(DATA, name)).get_device()
+
+    def command(self, cls, device):
+        return cls(self.svd.index_device(device), self.svd.detect_backend())
+
+    def output(self):
+        return "".join(self.svd.gdb.output)
+
+
+class LoadDeviceTest(GdbSvdTestCase):
+    def test_register_arrays_and_clusters_are_cached(self):
+        path = os.path.join(DATA, "arrays.svd")
+        self.svd.load_device(path)
+        self.assertTrue(os.path.exists(self.svd.get_cache_path(path)))
+
+        device = self.svd.load_device(path)
+        registers = device.get_peripherals()[0].get_registers()
+        self.assertEqual(registers[1]._wrapped_desc, "Capture compare register")
+        self.assertEqual(registers[-1]._wrapped_desc, "Channel data")
+
+    def copy_svd(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        path = os.path.join(tmp_dir.name, "arrays.svd")
+        with open(os.path.join(DATA, "arrays.svd")) as src:
+            with open(path, "w") as dst:
+                dst.write(src.read())
+        return path
+
+    def peripheral_names(self, path):
+        return [p.name for p in self.svd.load_device(path).get_peripherals()]
+
+    def test_changed_mtime_parses_the_file_again(self):
+        path = self.copy_svd()
+        self.peripheral_names(path)
+        with open(path) as svd_file:
+            text = svd_file.read().replace("TIM1", "TIM9")
+        mtime = os.stat(path).st_mtime
+        with open(path, "w") as svd_file:
+            svd_file.write(text)
+        os.utime(path, (mtime + 10, mtime + 10))
+
+        self.assertEqual(self.peripheral_names(path), ["TIM9", "UART1"])
+
+    def test_changed_size_parses_the_file_again(self):
+        path = self.copy_svd()
+        self.peripheral_names(path)
+        with open(path) as svd_file:
+            text = svd_file.read().replace("TIM1", "TIM10")
+        stat = os.stat(path)
+        with open(path, "w") as svd_file:
+            svd_file.write(text)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertEqual(self.peripheral_names(path), ["TIM10", "UART1"])
+
+    def test_unreadable_cache_entry_parses_the_file_again(self):
+        path = os.path.join(DATA, "arrays.svd")
+        os.makedirs(self.svd.SVD_CACHE_DIR)
+        with open(self.svd.get_cache_path(path), "wb") as cache:
+            cache.write(b"\x80\x05truncated")
+
+        self.assertEqual(self.peripheral_names(path), ["TIM1", "UART1"])
+
+    def test_cache_of_other_cmsis_svd_version_parses_the_file_again(self):
+        path = os.path.join(DATA, "arrays.svd")
+        os.makedirs(self.svd.SVD_CACHE_DIR)
+        with open(self.svd.get_cache_path(path), "wb") as cache:
+            self.svd.pickle.dump(("0.0", None), cache)
+
+        self.assertEqual(self.peripheral_names(path), ["TIM1", "UART1"])
+
+    def test_failed_cache_write_leaves_no_file(self):
+        path = os.path.join(DATA, "arrays.svd")
+        with mock.patch.object(self.svd.pickle, "dump", side_effect=OSError):
+            self.assertEqual(self.peripheral_names(path), ["TIM1", "UART1"])
+
+        self.assertEqual(os.listdir(self.svd.SVD_CACHE_DIR), [])
+
+
+class IndexDeviceTest(GdbSvdTestCase):
+    def test_register_arrays_and_clusters_are_flattened(self):
+        index = self.svd.index_device(self.parse("arrays.svd"))
+        tim = index.by_name["TIM1"]
+
+        self.assertEqual(
+            [register.name for register in tim._registers],
+            ["CR", "CCR0", "CCR1", "CCR2", "CCR3", "CH_CFG", "CH_DATA"],
+        )
+        self.assertEqual(tim._reg_by_name["CCR2"]._abs_addr, 0x40010018)
+        self.assertEqual(tim._reg_by_name["CH_DATA"]._abs_addr, 0x40010044)
+
+    def test_field_arrays_are_flattened(self):
+        index = self.svd.index_device(self.parse("arrays.svd"))
+        cr = index.by_name["TIM1"]._reg_by_name["CR"]
+
+        self.assertEqual(cr._field_names_sorted, ["EN", "FLAG0", "FLAG1"])
+        self.assertEqual(cr._field_by_name["FLAG1"].bit_offset, 5)
+
+
+class TableTest(GdbSvdTestCase):
+    def table(self, *args, **kwargs):
+        out = []
+        self.svd.emit_table(*args, out=out.append, **kwargs)
+        return "".join(out)
+
+    def test_columns_fit_the_widest_cell_line(self):
+        rows = [["Name", "Value"], ["CR", "0x1\n0x22"], ["LONGNAME", "x"]]
+
+        self.assertEqual(
+            self.table(rows, title="TIM1"),
+            "+TIM1------+-------+\n"
+            "| Name     | Value |\n"
+            "+----------+-------+\n"
+            "| CR       | 0x1   |\n"
+            "|          | 0x22  |\n"
+            "| LONGNAME | x     |\n"
+            "+----------+-------+\n",
+        )
+
+    def test_title_wider_than_the_table_is_left_out(self):
+        self.assertEqual(
+            self.table([["A", "B"], ["1", "2"]], title="A long title"),
+            "+---+---+\n| A | B |\n+---+---+\n| 1 | 2 |\n+---+---+\n",
+        )
+
+    def test_color_codes_take_no_width(self):
+        rows = [["Name"], [self.svd.highlight("CR")], ["SR"]]
+
+        self.assertEqual(
+            self.table(rows).splitlines()[3], f"| {self.svd.highlight('CR')}   |"
+        )
+
+
+class PrefixRangeTest(GdbSvdTestCase):
+    NAMES = ["CR", "CR1", "CR2", "DR", "SR"]
+
+    def test_exact_match(self):
+        self.assertEqual(self.svd.prefix_range(self.NAMES, "DR"), (3, 4))
+
+    def test_shared_prefix(self):
+        self.assertEqual(self.svd.prefix_range(self.NAMES, "CR"), (0, 3))
+        self.assertEqual(self.svd.prefix_matches(self.NAMES, "CR"), self.NAMES[:3])
+
+    def test_empty_prefix_matches_all_names(self):
+        self.assertEqual(self.svd.prefix_range(self.NAMES, ""), (0, 5))
+
+    def test_no_match(self):
+        self.assertEqual(self.svd.prefix_range(self.NAMES, "CS"), (3, 3))
+        self.assertEqual(self.svd.prefix_matches(self.NAMES, "CR3"), [])
+
+    def test_prefix_past_the_last_name(self):
+        self.assertEqual(self.svd.prefix_range(self.NAMES, "ZZ"), (5, 5))
+
+    def test_lookup_returns_the_matching_items(self):
+        items = [name.lower() for name in self.NAMES]
+
+        self.assertEqual(
+            self.svd.prefix_lookup(self.NAMES, items, "CR"), ["cr", "cr1", "cr2"]
+        )
+
+
+class RegisterTableTest(GdbSvdTestCase):
+    def setUp(self):
+        super().setUp()
+        device = self.svd.load_device(os.path.join(DATA, "arrays.svd"))
+        self.cmd = self.command(self.svd.GdbSvdGetCmd, device)
+        for address in range(0x40010000, 0x40010048, 4):
+            self.target.memory[address] = 0xFFFFFFFF
+
+    def table_lines(self):
+        self.cmd.invoke("TIM1", False)
+        return self.svd._STRIP_ANSI.sub("", self.output()).splitlines()
+
+    def test_stream_table_writes_each_row_on_its_own(self):
+        out = []
+        rows = iter([["1", "2"], ["333", "4\n55"]])
+
+        self.svd.stream_table(["a", "bb"], rows, [3, 2], title="T", out=out.append)
+
+        self.assertEqual(
+            out,
+            [
+                "+T----+----+\n| a   | bb |\n+-----+----+\n",
+                "| 1   | 2  |\n",
+                "| 333 | 4  |\n|     | 55 |\n",
+                "+-----+----+\n",
+            ],
+        )
+
+    def test_values_wider_than_the_reset_values_fit_their_column(self):
+        lines = self.table_lines()
+
+        self.assertIn("| 0xffffffff(0x1) |", lines[3])
+        self.assertEqual({len(line) for line in lines}, {len(lines[0])})
+
+    def test_fields_wrap_between_fields(self):
+        self.cmd.column_with = 24
+        self.cmd.field_wrapper = TextWrapper(width=24)
+
+        lines = self.table_lines()
+
+        self.assertEqual(
+            [line.split("|")[4] for line in lines[3:6]],
+            [
+                " EN[0:0]=0x1(0x1)         ",
+                " FLAG0[4:4]=0x1(0x0)      ",
+                " FLAG1[5:5]=0x1(0x0)      ",
+            ],
+        )
+        self.assertEqual({len(line) for line in lines}, {len(lines[0])})
+
+    def test_field_wider_than_the_column_gets_its_own_line(self):
+        self.assertEqual(
+            self.svd.wrap_fields(["A=0x1", "LONG_FIELD=0x1", "B=0x1"], 8),
+            "A=0x1\nLONG_FIELD=0x1\nB=0x1",
+        )
+
+
+class CompleteTest(GdbSvdTestCase):
+    TIM1_REGISTERS = ["CCR0", "CCR1", "CCR2", "CCR3", "CH_CFG", "CH_DATA", "CR"]
+
+    def setUp(self):
+        super().setUp()
+        device = self.svd.load_device(os.path.join(DATA, "arrays.svd"))
+        self.cmds = {
+            name: self.command(cls, device)
+            for name, cls in [
+                ("get", self.svd.GdbSvdGetCmd),
+                ("set", self.svd.GdbSvdSetCmd),
+                ("info", self.svd.GdbSvdInfoCmd),
+                ("dump", self.svd.GdbSvdDumpCmd),
+            ]
+        }
+
+    def complete(self, name, text):
+        return self.cmds[name].complete(text, text.rpartition(" ")[2])
+
+    def test_empty_prefix_lists_all_peripherals(self):
+        for name in ("get", "set", "info"):
+            self.assertEqual(self.complete(name, ""), ["TIM1", "UART1"])
+
+    def test_peripheral_prefix_ignores_case(self):
+        self.assertEqual(self.complete("get", "ti"), ["TIM1"])
+        self.assertEqual(self.complete("get", "UA"), ["UART1"])
+
+    def test_registers_after_the_peripheral(self):
+        self.assertEqual(self.complete("get", "tim1 "), self.TIM1_REGISTERS)
+        self.assertEqual(
+            self.complete("get", "TIM1 CC"), ["CCR0", "CCR1", "CCR2", "CCR3"]
+        )
+
+    def test_unknown_peripheral_completes_nothing(self):
+        self.assertEqual(self.complete("get", "TIM9 "), self.svd.gdb.COMPLETE_NONE)
+
+    def test_fields_after_the_register(self):
+        self.assertEqual(self.complete("info", "TIM1 CR "), ["EN", "FLAG0", "FLAG1"])
+        self.assertEqual(self.complete("set", "TIM1 CR fl"), ["FLAG0", "FLAG1"])
+
+    def test_no_field_argument_for_svd_get(self):
+        self.assertEqual(self.complete("get", "TIM1 CR "), self.svd.gdb.COMPLETE_NONE)
+
+    def test_no_argument_after_the_field(self):
+        for name in ("set", "info"):
+            self.assertEqual(
+                self.complete(name, "TIM1 CR EN "), self.svd.gdb.COMPLETE_NONE
+            )
+
+    def test_dump_completes_the_file_then_the_peripheral(self):
+        filename = self.svd.gdb.COMPLETE_FILENAME
+        self.assertEqual(self.complete("dump", ""), filename)
+        self.assertEqual(self.complete("dump", "regs.t"), filename)
+        self.assertEqual(self.complete("dump", "regs.txt "), ["TIM1", "UART1"])
+        self.assertEqual(self.complete("dump", "regs.txt u"), ["UART1"])
+        self.assertEqual(
+            self.complete("dump", "regs.txt UART1 "), self.svd.gdb.COMPLETE_NONE
+        )
+
+
+class GetCmdTest(GdbSvdTestCase):
+    def test_svd_get_on_register_arrays_and_clusters(self):
+        device = self.svd.load_device(os.path.join(DATA, "arrays.svd"))
+        self.target.memory[0x40010018] = 0x5
+        self.target.memory[0x40010044] = 0x1234
+
+        self.command(self.svd.GdbSvdGetCmd, device).invoke("TIM1", False)
+
+        table = self.output()
+        self.assertIn("CCR2", table)
+        self.assertIn("0x5(0x0)", table)
+        self.assertIn("CH_DATA", table)
+        self.assertIn("0x1234(0x0)", table)
+
+
+class ReadSpansTest(GdbSvdTestCase):
+    def setUp(self):
+        super().setUp()
+        self.device = self.svd.load_device(os.path.join(DATA, "arrays.svd"))
+        self.cmd = self.command(self.svd.GdbSvdGetCmd, self.device)
+
+    def spans(self, name):
+        peripheral = self.cmd.index.by_name[name]
+        return self.cmd.get_read_spans(peripheral._registers)
+
+    def test_close_registers_share_a_span(self):
+        self.assertEqual(self.spans("TIM1"), [(0x40010000, 18)])
+
+    def test_spans_stop_at_write_only_and_read_action_registers(self):
+        self.assertEqual(
+            self.spans("UART1"),
+            [(0x40010100, 1), (0x40010108, 1), (0x40010110, 1)],
+        )
+
+    def test_spans_stay_within_address_blocks(self):
+        registers = [
+            register
+            for peripheral in self.cmd.index.items
+            for register in peripheral._registers
+        ]
+        spans = self.cmd.get_read_spans(registers)
+
+        self.assertEqual(spans[0], (0x40010000, 18))
+        self.assertEqual(spans[1], (0x40010100, 1))
+
+    def test_spans_without_address_block_stop_at_gaps(self):
+        self.device = self.svd.load_device(os.path.join(DATA, "arrays.svd"))
+        for peripheral in self.device.get_peripherals():
+            peripheral.address_blocks = None
+        self.cmd = self.command(self.svd.GdbSvdGetCmd, self.device)
+
+        self.assertEqual(
+            self.spans("TIM1"),
+            [(0x40010000, 1), (0x40010010, 4), (0x40010040, 2)],
+        )
+
+    def test_svd_get_reads_only_address_blocks(self):
+        self.cmd.invoke("", False)
+
+        for command in self.target.commands:
+            if not command.startswith("monitor mdw"):
+                continue
+            address, *count = command.split()[3:]
+            start = int(address, 16)
+            end = start + 4 * int(count[0] if count else 1)
+            self.assertTrue(
+                end <= 0x40010100 or 0x40010100 <= start < end <= 0x40010120,
+                command,
+            )
+
+    def test_read_action_register_is_read_alone(self):
+        self.cmd.invoke("UART1", False)
+
+        self.assertIn("monitor mdw phys 0x40010104", self.target.commands)
+        self.assertNotIn("monitor mdw phys 0x4001010c", self.target.commands)
+
+
+class ReadOutputTest(GdbSvdTestCase):
+    ERROR = "Error: Failed to read memory at 0x40010000\n"
+
+    def setUp(self):
+        super().setUp()
+        device = self.svd.load_device(os.path.join(DATA, "arrays.svd"))
+        self.cmd = self.command(self.svd.GdbSvdGetCmd, device)
+        self.cr = self.cmd.index.by_name["TIM1"]._reg_by_name["CR"]
+
+    def test_read_value(self):
+        self.target.memory[0x40010000] = 0xFA00
+        self.assertEqual(self.cmd.read(self.cr), 0xFA00)
+
+    def test_read_error_output_raises(self):
+        self.target.mdw_output = self.ERROR
+        with self.assertRaisesRegex(Exception, "Failed to read memory"):
+            self.cmd.read(self.cr)
+
+    def test_read_block_error_output_raises(self):
+        self.target.mdw_output = self.ERROR
+        with self.assertRaisesRegex(Exception, "Failed to read memory"):
+            self.cmd.read_block(0x40010000, 4)
+
+    def test_read_block_incomplete_output_raises(self):
+        self.target.mdw_output = "0x40010000: 00000001 00000002 \n" + self.ERROR
+        with self.assertRaises(Exception):
+            self.cmd.read_block(0x40010000, 4)
+
+    def test_svd_get_shows_read_errors(self):
+        self.target.mdw_output = self.ERROR
+        self.cmd.invoke("TIM1 CR", False)
+
+        table = self.output()
+        self.assertIn("Failed to read memory", table)
+        self.assertNotIn("0xfa", table.lower())
+
+
+class InferiorMemoryTest(GdbSvdTestCase):
+    def setUp(self):
+        super().setUp()
+        self.target.monitor = False
+        self.device = self.svd.load_device(os.path.join(DATA, "arrays.svd"))
+
+    def get(self, arg):
+        self.command(self.svd.GdbSvdGetCmd, self.device).invoke(arg, False)
+        return self.output()
+
+    def test_registers_are_read_in_blocks(self):
+        self.target.memory[0x40010018] = 0x5
+
+        self.assertIn("0x5(0x0)", self.get("TIM1"))
+        self.assertEqual(self.target.reads, [(0x40010000, 72)])
+
+    def test_big_endian_words(self):
+        self.target.word_format = ">I"
+        self.target.memory[0x40010044] = 0x12345678
+
+        self.assertIn("0x12345678(0x0)", self.get("TIM1"))
+
+    def test_faulting_block_falls_back_on_single_reads(self):
+        # a word between the registers, not one of them
+        self.target.faults.add(0x40010008)
+        self.target.memory[0x40010044] = 0x1234
+
+        table = self.get("TIM1")
+
+        self.assertIn("0x1234(0x0)", table)
+        self.assertNotIn("Error", table)
+        self.assertIn((0x40010044, 4), self.target.reads)
+
+    def test_read_action_register_is_read_alone(self):
+        self.target.memory[0x40010104] = 0x41
+
+        self.assertIn("0x41(0x0)", self.get("UART1"))
+        self.assertIn((0x40010104, 4), self.target.reads)
+        self.assertNotIn((0x4001010C, 4), self.target.reads)
+
+    def test_write_goes_to_the_inferior_memory(self):
+        self.target.memory[0x40010000] = 0x10
+        set_cmd = self.command(self.svd.GdbSvdSetCmd, self.device)
+
+        set_cmd.invoke("TIM1 CR EN 0x1", False)
+
+        self.assertEqual(self.target.memory[0x40010000], 0x11)
+        self.assertEqual([cmd for cmd in self.target.commands if "mww" in cmd], [])
+
+    def test_memory_error_shows_an_error_row(self):
+        self.target.faults.add(0x40010010)
+
+        lines = self.svd._STRIP_ANSI.sub("", self.get("TIM1")).splitlines()
+        rows = {line.split("|")[1].strip(): line for line in lines if "|" in line}
+
+        self.assertIn("| Error ", rows["CCR0"])
+        self.assertIn("Cannot access memory at address 0x40010010", rows["CCR0"])
+        self.assertIn("| 0x0(0x0) ", rows["CCR1"])
+
+
+class ValueCacheTest(GdbSvdTestCase):
+    def setUp(self):
+        super().setUp()
+        device = self.svd.load_device(os.path.join(DATA, "arrays.svd"))
+        self.cmd = self.command(self.svd.GdbSvdGetCmd, device)
+        self.set_cmd = self.command(self.svd.GdbSvdSetCmd, device)
+        self.tim = self.cmd.index.by_name["TIM1"]
+
+    def reads(self):
+        return [cmd for cmd in self.target.commands if " mdw " in cmd]
+
+    def test_second_svd_get_reads_nothing_while_stopped(self):
+        self.cmd.invoke("TIM1", False)
+        reads = self.reads()
+        self.target.memory[0x40010000] = 0x5678
+
+        self.cmd.invoke("TIM1", False)
+
+        self.assertEqual(self.reads(), reads)
+        self.assertNotIn("0x5678", self.output())
+
+    def test_target_events_forget_read_values(self):
+        self.cmd.invoke("TIM1 CR", False)
+        self.target.memory[0x40010000] = 0x5678
+
+        self.svd.clear_value_cache(object())
+        self.cmd.invoke("TIM1 CR", False)
+
+        self.assertIn("0x5678", self.output())
+
+    def test_write_forgets_all_read_values(self):
+        ccr1 = self.tim._reg_by_name["CCR1"]
+        self.assertEqual(self.cmd.read(ccr1), 0)
+        self.target.memory[0x40010014] = 0x10
+
+        self.set_cmd.invoke("TIM1 CCR0 0x1", False)
+
+        self.assertEqual(self.target.memory[0x40010010], 0x1)
+        self.assertEqual(self.cmd.read(ccr1), 0x10)
+
+    def test_field_write_reads_the_register_from_the_target(self):
+        cr = self.tim._reg_by_name["CR"]
+        self.assertEqual(self.cmd.read(cr), 0)
+        self.target.memory[0x40010000] = 0x10
+
+        self.set_cmd.invoke("TIM1 CR EN 0x1", False)
+
+        self.assertEqual(self.target.memory[0x40010000], 0x11)
+
+
+if __name__ == "__main__":
+    unittest.main()